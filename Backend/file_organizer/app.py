@@ -5,6 +5,7 @@ from .routes import register_routes, load_config
 from .file_watcher import start_all_watchers
 from pathlib import Path
 import json
+import threading
 from config.settings import DATA_DIR
 
 
@@ -12,26 +13,31 @@ def create_file_organizer_app():
     """Create and configure the file organizer Flask app"""
     app = Flask(__name__)
     CORS(app)
-    
-    # Initialize AI models
-    initialize_models()
-    
-    # Load configuration
+
+    # Load configuration (fast; the routes need it immediately)
     load_config()
-    
+
     # Initialize history file if it doesn't exist
     HISTORY_FILE = DATA_DIR / "file_history.json"
     if not HISTORY_FILE.exists():
         with open(HISTORY_FILE, 'w') as f:
             json.dump([], f)
         print("📝 Initialized history file")
-    
+
     # Register API routes
     register_routes(app)
-    
-    # Start file watchers
-    start_all_watchers()
-    
+
+    # Heavy startup — the model loads take seconds and hundreds of MB —
+    # runs off the critical path so the API starts listening at once.
+    # /api/health reports models_ready, and the model-backed routes
+    # answer 503 until warmup finishes. Watchers start after the models
+    # they feed files into.
+    def warmup():
+        initialize_models()
+        start_all_watchers()
+
+    threading.Thread(target=warmup, daemon=True).start()
+
     print("📡 File Organizer API ready")
     print("Endpoints:")
     print("  GET  /api/health")
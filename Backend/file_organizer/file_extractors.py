@@ -162,8 +162,10 @@ class MultiModalExtractor:
     @staticmethod
     def _extract_text(file_path: str) -> str:
         """Extract plain text"""
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+        # Read raw bytes in one call and decode once; text mode funnels the
+        # file through an incremental decoder chunk by chunk.
+        with open(file_path, "rb") as f:
+            return f.read().decode("utf-8", errors="ignore")
 
     @staticmethod
     def _extract_pdf(file_path: str) -> Dict:
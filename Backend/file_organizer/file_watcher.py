@@ -19,6 +19,24 @@ logger = setup_logger(__name__)
 scanner_thread_obj = None
 stop_scanner = threading.Event()
 
+# One Observer (and one OS watch facility) shared by all watched folders;
+# per-folder observers each cost a thread and an inotify instance, and every
+# event wakes all of them. Folders are scheduled/unscheduled as watches on
+# this single instance. watchdog Observers cannot be restarted once stopped,
+# so the instance is recreated lazily after a full stop.
+_shared_observer = None
+_observer_lock = threading.Lock()
+
+
+def _get_observer():
+    """Return the running shared Observer, creating it on first use
+    (caller holds _observer_lock)"""
+    global _shared_observer
+    if _shared_observer is None:
+        _shared_observer = Observer()
+        _shared_observer.start()
+    return _shared_observer
+
 
 def is_hidden(path_obj):
     """Check if file is hidden"""
@@ -109,18 +127,17 @@ def should_process_file(file_path: str, current_settings_hash: str) -> bool:
 
 
 def start_watching(folder_id: int, folder_path: str):
-    """Start real-time watchdog for a folder"""
+    """Schedule real-time watching for a folder on the shared observer"""
     if folder_id in state.observers:
         return
     if not Path(folder_path).exists():
         return
 
     event_handler = FileHandler(folder_id)
-    observer = Observer()
-    observer.schedule(event_handler, folder_path, recursive=False)
-    observer.start()
+    with _observer_lock:
+        watch = _get_observer().schedule(event_handler, folder_path, recursive=False)
 
-    state.observers[folder_id] = {"observer": observer, "handler": event_handler}
+    state.observers[folder_id] = {"watch": watch, "handler": event_handler}
 
     def processing_loop():
         while folder_id in state.observers and not stop_scanner.is_set():
@@ -131,12 +148,19 @@ def start_watching(folder_id: int, folder_path: str):
 
 
 def stop_watching(folder_id: int):
+    global _shared_observer
     if folder_id not in state.observers:
         return
-    data = state.observers[folder_id]
-    data["observer"].stop()
-    data["observer"].join()
-    del state.observers[folder_id]
+    data = state.observers.pop(folder_id)
+    with _observer_lock:
+        if _shared_observer is None:
+            return
+        _shared_observer.unschedule(data["watch"])
+        if not state.observers:
+            # Last watch gone: retire the observer thread entirely
+            _shared_observer.stop()
+            _shared_observer.join()
+            _shared_observer = None
 
 
 def stop_all_watchers():
@@ -190,14 +214,17 @@ def run_scan_pass():
     for folder in state.watched_folders:
         if folder.get("status") != "Active":
             continue
-        path = Path(folder["path"])
-        if not path.exists():
+        try:
+            with os.scandir(folder["path"]) as entries:
+                file_paths = [
+                    e.path for e in entries if e.is_file(follow_symlinks=False)
+                ]
+        except OSError:
             continue
 
-        for file_path in path.iterdir():
-            if file_path.is_file():
-                if should_process_file(str(file_path), settings_hash):
-                    try:
-                        process_file(str(file_path), folder["id"])
-                    except Exception as e:
-                        logger.error(f"Error processing {file_path}: {e}")
+        for file_path in file_paths:
+            if should_process_file(file_path, settings_hash):
+                try:
+                    process_file(file_path, folder["id"])
+                except Exception as e:
+                    logger.error(f"Error processing {file_path}: {e}")
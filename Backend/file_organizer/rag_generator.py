@@ -7,10 +7,114 @@ Smart updates: Updates existing records instead of creating duplicates.
 import json
 import hashlib
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
-from config.settings import RAG_DATA_DIR as RAG_DIR, CHUNK_SIZE, CHUNK_OVERLAP
+from typing import List, Dict, Optional
+from config.settings import RAG_DATA_DIR as RAG_DIR, CHUNK_SIZE, CHUNK_OVERLAP, MAX_WORKERS
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Inverted index over RAG documents (token -> rag filenames). Entries carry
+# the file's mtime, so unchanged documents are parsed once and reused across
+# searches; new, rewritten and deleted files are picked up lazily.
+_index_lock = threading.Lock()
+_index_docs = {}  # rag filename -> {"mtime", "filename_lower", "token_scores", "display"}
+_index_tokens = {}  # token -> set of rag filenames
+
+
+def _index_entry(rag_file: Path, mtime: float) -> Optional[Dict]:
+    """Parse one RAG document into an index entry with per-token scores"""
+    try:
+        with open(rag_file, "rb") as f:
+            raw = f.read()
+        # orjson decodes 3-5x faster than stdlib json when available
+        rag_doc = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    except Exception:
+        return None
+
+    # Precompute each token's score contribution using the same weights the
+    # linear scan applied: summary hit 3, keyword hit 5, chunk hit 1.
+    token_scores = {}
+    summary = rag_doc.get("analysis", {}).get("summary", "")
+    for token in set(summary.lower().split()):
+        token_scores[token] = token_scores.get(token, 0) + 3
+    for keyword in rag_doc.get("analysis", {}).get("keywords", []):
+        token = keyword.lower()
+        token_scores[token] = token_scores.get(token, 0) + 5
+    for chunk in rag_doc.get("content", {}).get("chunks", []):
+        for token in set(chunk.lower().split()):
+            token_scores[token] = token_scores.get(token, 0) + 1
+
+    file_info = rag_doc.get("file_info", {})
+    analysis = rag_doc.get("analysis", {})
+    return {
+        "mtime": mtime,
+        "filename_lower": file_info.get("filename", "").lower(),
+        "token_scores": token_scores,
+        "display": {
+            "file": file_info.get("filename", rag_file.stem),
+            "path": file_info.get("original_path", ""),
+            "summary": analysis.get("summary", ""),
+            "keywords": analysis.get("keywords", []),
+            "content_preview": rag_doc.get("content", {}).get("full_text", "")[:500],
+        },
+    }
+
+
+def _drop_postings(name: str):
+    for token in _index_docs[name]["token_scores"]:
+        _index_tokens.get(token, set()).discard(name)
+
+
+def _refresh_index():
+    """Sync the inverted index with RAG_DIR (caller holds _index_lock)"""
+    seen = set()
+    stale = []  # (name, rag_file, mtime) needing a (re)parse
+    for rag_file in RAG_DIR.glob("*.rag.json"):
+        name = rag_file.name
+        try:
+            mtime = rag_file.stat().st_mtime
+        except OSError:
+            continue
+        seen.add(name)
+
+        old_entry = _index_docs.get(name)
+        if old_entry and old_entry["mtime"] == mtime:
+            continue
+        stale.append((name, rag_file, mtime))
+
+    if stale:
+        # Reads are independent per file; overlap the disk I/O for bulk
+        # refreshes (first search after processing a big folder).
+        if len(stale) == 1:
+            parsed = [_index_entry(stale[0][1], stale[0][2])]
+        else:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                parsed = list(
+                    executor.map(lambda item: _index_entry(item[1], item[2]), stale)
+                )
+
+        for (name, _, _), entry in zip(stale, parsed):
+            if name in _index_docs:
+                _drop_postings(name)
+            if entry is None:
+                _index_docs.pop(name, None)
+                continue
+            _index_docs[name] = entry
+            for token in entry["token_scores"]:
+                _index_tokens.setdefault(token, set()).add(name)
+
+    for name in list(_index_docs):
+        if name not in seen:
+            _drop_postings(name)
+            del _index_docs[name]
 
 
 class RAGGenerator:
@@ -149,47 +253,30 @@ class RAGGenerator:
     @staticmethod
     def search_rag(query: str, max_results: int = 5) -> List[Dict]:
         """
-        Search through all RAG documents for relevant information.
+        Search through all RAG documents via the inverted index.
         """
         results = []
         query_lower = query.lower()
         query_words = set(query_lower.split())
 
-        for rag_file in RAG_DIR.glob("*.rag.json"):
-            try:
-                with open(rag_file, "r", encoding="utf-8") as f:
-                    rag_doc = json.load(f)
-
-                score = 0
-                filename = rag_doc.get("file_info", {}).get("filename", "").lower()
-                if query_lower in filename:
-                    score += 10
-
-                summary = rag_doc.get("analysis", {}).get("summary", "").lower()
-                score += sum(word in summary for word in query_words) * 3
-
-                keywords = [
-                    k.lower() for k in rag_doc.get("analysis", {}).get("keywords", [])
-                ]
-                score += sum(word in keywords for word in query_words) * 5
-                for chunk in rag_doc.get("content", {}).get("chunks", []):
-                    if any(word in chunk.lower() for word in query_words):
-                        score += 1
-
-                if score > 0:
-                    results.append(
-                        {
-                            "file": rag_doc["file_info"]["filename"],
-                            "path": rag_doc["file_info"]["original_path"],
-                            "summary": rag_doc["analysis"]["summary"],
-                            "keywords": rag_doc["analysis"]["keywords"],
-                            "score": score,
-                            "content_preview": rag_doc["content"]["full_text"][:500],
-                        }
-                    )
-
-            except Exception:
-                continue
+        with _index_lock:
+            _refresh_index()
+
+            scores = {}
+            for word in query_words:
+                for name in _index_tokens.get(word, ()):
+                    entry = _index_docs[name]
+                    scores[name] = scores.get(name, 0) + entry["token_scores"][word]
+
+            # Filename bonus, same as the old scan
+            for name, entry in _index_docs.items():
+                if query_lower in entry["filename_lower"]:
+                    scores[name] = scores.get(name, 0) + 10
+
+            for name, score in scores.items():
+                result = dict(_index_docs[name]["display"])
+                result["score"] = score
+                results.append(result)
 
         results.sort(key=lambda x: x["score"], reverse=True)
         return results[:max_results]
@@ -5,7 +5,6 @@ Includes history tracking and settings endpoints
 
 import json
 import os
-import threading
 import stat
 import shutil
 from pathlib import Path
@@ -17,9 +16,10 @@ from config.settings import (
     load_user_settings,
     save_user_settings,
 )
-from .state import state, CACHE_FILE
+from .state import state, CACHE_FILE, CACHE_WAL_FILE
 from .file_watcher import stop_watching, start_all_watchers
 from .file_processor import process_file
+from .tools import start_processing_job
 from .rag_generator import RAGGenerator
 from .file_counter import count_files_in_folder
 from utils.logger import update_log_level, setup_logger
@@ -42,21 +42,15 @@ def load_config():
                         f["last_activity_timestamp"] = 0
                 state.categories = config.get("categories", [])
                 state.auto_organize = config.get("auto_organize", False)
+                state.rebuild_indexes()
         except Exception as e:
             logger.error(f"Error loading config: {e}")
 
 
 def save_config():
-    try:
-        config = {
-            "watched_folders": state.watched_folders,
-            "categories": state.categories,
-            "auto_organize": state.auto_organize,
-        }
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        logger.error(f"Error saving config: {e}")
+    # Single config writer: state.save_to_disk does the tmp-file +
+    # os.replace dance, so a crash mid-write never leaves a torn file.
+    state.save_to_disk()
 
 
 def load_history():
@@ -110,6 +104,18 @@ def is_hidden_check(path):
 
 
 def register_routes(app):
+    # Routes that drive files through the AI pipeline; everything else
+    # (health, config, history) works while the models are still loading.
+    model_prefixes = ("/api/process-folder", "/api/upload-and-process", "/api/rag")
+
+    @app.before_request
+    def reject_until_models_ready():
+        if not state.is_initialized and request.path.startswith(model_prefixes):
+            return (
+                jsonify({"success": False, "error": "Models are still loading"}),
+                503,
+            )
+
     @app.route("/api/health", methods=["GET"])
     def health_check():
         return jsonify(
@@ -172,29 +178,42 @@ def register_routes(app):
         try:
             counts = {"rag": 0, "temp": 0, "cache": 0}
             if RAG_DATA_DIR.exists():
-                for f in RAG_DATA_DIR.iterdir():
-                    if f.is_file() and f.suffix == ".json":
+                with os.scandir(str(RAG_DATA_DIR)) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False) and entry.name.endswith(
+                            ".json"
+                        ):
+                            try:
+                                os.unlink(entry.path)
+                                counts["rag"] += 1
+                            except OSError as e:
+                                logger.warning(
+                                    f"Could not delete RAG file {entry.path}: {e}"
+                                )
+            if TEMP_UPLOADS_DIR.exists():
+                with os.scandir(str(TEMP_UPLOADS_DIR)) as entries:
+                    for entry in entries:
                         try:
-                            f.unlink()
-                            counts["rag"] += 1
+                            if entry.is_file(follow_symlinks=False):
+                                os.unlink(entry.path)
+                            elif entry.is_dir(follow_symlinks=False):
+                                shutil.rmtree(entry.path)
+                            counts["temp"] += 1
                         except OSError as e:
-                            logger.warning(f"Could not delete RAG file {f}: {e}")
-            if TEMP_UPLOADS_DIR.exists():
-                for f in TEMP_UPLOADS_DIR.iterdir():
-                    try:
-                        if f.is_file():
-                            f.unlink()
-                        elif f.is_dir():
-                            shutil.rmtree(f)
-                        counts["temp"] += 1
-                    except OSError as e:
-                        logger.warning(f"Could not delete temp file {f}: {e}")
+                            logger.warning(
+                                f"Could not delete temp file {entry.path}: {e}"
+                            )
             if CACHE_FILE.exists():
                 try:
                     CACHE_FILE.unlink()
                     counts["cache"] += 1
                 except OSError as e:
                     logger.warning(f"Could not delete cache file: {e}")
+            if CACHE_WAL_FILE.exists():
+                try:
+                    CACHE_WAL_FILE.unlink()
+                except OSError as e:
+                    logger.warning(f"Could not delete cache journal: {e}")
 
             state.processed_cache = {}
 
@@ -227,6 +246,7 @@ def register_routes(app):
                 "last_activity_timestamp": 0,
             }
             state.watched_folders.append(new_folder)
+            state.rebuild_indexes()
             save_config()
             start_all_watchers()
             return jsonify({"folder": new_folder})
@@ -253,6 +273,7 @@ def register_routes(app):
         state.watched_folders = [
             f for f in state.watched_folders if f["id"] != folder_id
         ]
+        state.rebuild_indexes()
         save_config()
         return jsonify({"success": True})
 
@@ -268,6 +289,7 @@ def register_routes(app):
                 "rules": 0,
             }
             state.categories.append(new_category)
+            state.rebuild_indexes()
             save_config()
             return jsonify({"category": new_category})
         return jsonify(state.categories)
@@ -276,6 +298,7 @@ def register_routes(app):
     def modify_category(category_id):
         if request.method == "DELETE":
             state.categories = [c for c in state.categories if c["id"] != category_id]
+            state.rebuild_indexes()
             save_config()
             return jsonify({"success": True})
         data = request.json
@@ -286,6 +309,7 @@ def register_routes(app):
             category["name"] = data["name"]
         if "path" in data:
             category["path"] = data["path"]
+        state.rebuild_indexes()
         save_config()
         return jsonify({"category": category})
 
@@ -303,35 +327,27 @@ def register_routes(app):
         skip_hidden = settings.get("skipHiddenFiles", True)
 
         files = []
-        for f in folder_path.iterdir():
-            if f.is_file():
-                if skip_hidden and is_hidden_check(f):
-                    continue
-                files.append(str(f))
-
-        state.processing_progress[folder_id] = {
-            "total": len(files),
-            "completed": 0,
-            "failed": 0,
-            "in_progress": 0,
-        }
-
-        def process_in_background():
-            for file_path in files:
-                try:
-                    result = process_file(file_path, folder_id)
-                    if result.get("status") == "success":
-                        state.processing_progress[folder_id]["completed"] += 1
-                    else:
-                        state.processing_progress[folder_id]["failed"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {e}")
-                    state.processing_progress[folder_id]["failed"] += 1
+        with os.scandir(str(folder_path)) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    if skip_hidden and is_hidden_check(Path(entry.path)):
+                        continue
+                    files.append(entry.path)
+
+        if not files:
+            folder["fileCount"] = count_files_in_folder(folder["path"])
+            save_config()
+            return jsonify({"status": "accepted", "total": 0})
+
+        def refresh_folder_count():
             folder["fileCount"] = count_files_in_folder(folder["path"])
             save_config()
 
-        thread = threading.Thread(target=process_in_background, daemon=True)
-        thread.start()
+        # start_processing_job owns the progress bookkeeping: it initializes
+        # the counters for a fresh job and extends the totals of a running
+        # one, so a repeated POST merges instead of clobbering and running
+        # a second overlapping job on the same folder.
+        start_processing_job(files, folder_id, on_complete=refresh_folder_count)
         return jsonify({"status": "accepted", "total": len(files)})
 
     @app.route("/api/process-folder/<int:folder_id>/progress", methods=["GET"])
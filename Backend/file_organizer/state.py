@@ -1,10 +1,43 @@
-from threading import Lock
+from threading import Lock, Timer
 import json
+import os
+import sys
 from pathlib import Path
 from datetime import datetime
 from config.settings import DATA_DIR, CONFIG_FILE
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(data):
+    """Deserialize JSON bytes/str, using orjson when available"""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def _dump_bytes(obj, indent=False):
+    """Serialize to JSON bytes, using orjson when available.
+
+    orjson is several times faster than stdlib json on the large
+    processed-cache dict, which matters because the cache is snapshotted
+    during processing runs.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
 CACHE_FILE = DATA_DIR / "processed_files_cache.json"
+# Append-only journal of cache updates since the last full snapshot.
+# Replayed over CACHE_FILE on load; compacted back into it periodically.
+CACHE_WAL_FILE = DATA_DIR / "processed_files_cache.wal"
+# Full snapshots grow O(n) with cache size, so rewrite only every N updates
+WAL_COMPACT_EVERY = 200
 
 class FileOrganizerState:
     def __init__(self):
@@ -31,31 +64,102 @@ class FileOrganizerState:
         
         # Cache to track processed files
         self.processed_cache = self._load_cache()
+        self._wal_updates = 0
+
+        # Fast-lookup indexes (kept in sync via rebuild_indexes)
+        self.watched_paths = set()
+        self.category_names = set()
+        self.folders_by_path = {}
+        self.folders_by_name = {}
+
+        # Pending debounced-save timer (see save_to_disk_async)
+        self._save_timer = None
+
+    @staticmethod
+    def normalize_path(path) -> str:
+        """Canonical interned form used for path comparisons.
+
+        normcase handles Windows case/slash rules correctly (unlike a plain
+        .lower()), and interning makes repeat comparisons pointer-fast.
+        """
+        return sys.intern(os.path.normcase(os.path.normpath(str(path))))
+
+    def rebuild_indexes(self):
+        """Refresh the fast-lookup indexes after folders/categories change"""
+        self.folders_by_path = {
+            self.normalize_path(f["path"]): f for f in self.watched_folders
+        }
+        self.folders_by_name = {f["name"].lower(): f for f in self.watched_folders}
+        self.watched_paths = set(self.folders_by_path)
+        self.category_names = {c["name"].lower() for c in self.categories}
 
     def _load_cache(self):
+        cache = {}
         if CACHE_FILE.exists():
             try:
-                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+                with open(CACHE_FILE, 'rb') as f:
+                    cache = _loads(f.read())
+            except (OSError, ValueError) as e:
+                print(f"Error loading cache (starting fresh): {e}")
+                cache = {}
+        if CACHE_WAL_FILE.exists():
+            try:
+                with open(CACHE_WAL_FILE, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = _loads(line)
+                        except ValueError:
+                            # Torn tail line from a crash mid-append;
+                            # everything before it is still good.
+                            continue
+                        path = record.pop("path", None)
+                        if path:
+                            cache[path] = record
+            except OSError as e:
+                print(f"Error replaying cache journal: {e}")
+        return cache
 
     def save_cache(self):
+        # Write to a temp file then atomically swap it in, so a crash
+        # mid-write never leaves a torn/corrupt cache behind.
+        tmp_file = CACHE_FILE.with_suffix('.json.tmp')
         try:
-            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.processed_cache, f, indent=2)
+            with open(tmp_file, 'wb') as f:
+                # Compact encoding: the cache is machine-only, indentation
+                # would double the bytes written on every flush.
+                f.write(_dump_bytes(self.processed_cache))
+            os.replace(tmp_file, CACHE_FILE)
+            # Snapshot now covers everything: retire the journal
+            with open(CACHE_WAL_FILE, 'w', encoding='utf-8'):
+                pass
+            self._wal_updates = 0
         except Exception as e:
             print(f"Error saving cache: {e}")
 
     def update_file_status(self, file_path, status, mtime, settings_hash):
         with self.lock:
-            self.processed_cache[str(file_path)] = {
+            entry = {
                 "mtime": mtime,
                 "settings_hash": settings_hash,
                 "status": status
             }
-            self.save_cache()
+            self.processed_cache[str(file_path)] = entry
+            # Append one journal line instead of rewriting the whole cache
+            # (which is O(total files) per processed file).
+            try:
+                record = dict(entry, path=str(file_path))
+                with open(CACHE_WAL_FILE, 'ab') as f:
+                    f.write(_dump_bytes(record) + b"\n")
+                self._wal_updates += 1
+            except OSError as e:
+                print(f"Error appending cache journal: {e}")
+                self.save_cache()
+                return
+            if self._wal_updates >= WAL_COMPACT_EVERY:
+                self.save_cache()
 
     def update_folder_activity(self, folder_id):
         """Update the last activity timestamp for a watched folder"""
@@ -73,9 +177,31 @@ class FileOrganizerState:
                 'categories': self.categories,
                 'auto_organize': self.auto_organize
             }
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            tmp_file = CONFIG_FILE.with_suffix('.json.tmp')
+            with open(tmp_file, 'wb') as f:
+                # Keep the config indented: users do open it by hand
+                f.write(_dump_bytes(config, indent=True))
+            os.replace(tmp_file, CONFIG_FILE)
         except Exception as e:
             print(f"Error saving config state: {e}")
 
+    def save_to_disk_async(self):
+        """Schedule a coalesced save_to_disk on a background timer.
+
+        Request threads return immediately; any number of mutations inside
+        the 250 ms window end up as a single disk write. The atomic-rename
+        in save_to_disk keeps concurrent flushes safe.
+        """
+        with self.lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = Timer(0.25, self._flush_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _flush_save(self):
+        with self.lock:
+            self._save_timer = None
+        self.save_to_disk()
+
 state = FileOrganizerState()
\ No newline at end of file
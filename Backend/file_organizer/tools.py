@@ -3,27 +3,225 @@ Enhanced AI Tools - PRODUCTION VERSION with comprehensive logging
 All functions include detailed error handling and logging
 """
 
+import heapq
 import threading
 import time
 import os
 import json
+import secrets
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import ijson
+
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 from .state import state
 from .file_watcher import start_watching
 from .file_processor import process_file
+from .file_extractors import MultiModalExtractor
 from .file_counter import count_files_in_folder
 from utils.logger import setup_logger
-from config.settings import RAG_DATA_DIR
+from config.settings import RAG_DATA_DIR, MAX_WORKERS
 
 logger = setup_logger(__name__)
 
-# Pending confirmation tracker
-pending_confirmations = {}
+# Pending confirmation tracker: bounded with a TTL so unconfirmed prompts
+# (the common case for a chatbot) cannot accumulate file lists forever.
+_PENDING_MAX = 64
+_PENDING_TTL = 600.0  # seconds
+pending_confirmations = {}  # id -> (expires_at, payload)
+_pending_lock = threading.Lock()
+
+
+def _pending_put(confirmation_id: str, payload: Dict):
+    """Store a pending confirmation, evicting expired/oldest entries"""
+    now = time.monotonic()
+    with _pending_lock:
+        for key in [k for k, (exp, _) in pending_confirmations.items() if exp <= now]:
+            del pending_confirmations[key]
+        while len(pending_confirmations) >= _PENDING_MAX:
+            # Dicts iterate in insertion order, so this drops the oldest
+            del pending_confirmations[next(iter(pending_confirmations))]
+        pending_confirmations[confirmation_id] = (now + _PENDING_TTL, payload)
+
+
+def _pending_pop(confirmation_id: str) -> Optional[Dict]:
+    """Remove and return a pending confirmation, or None if missing/expired"""
+    with _pending_lock:
+        entry = pending_confirmations.pop(confirmation_id, None)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+# Home directory is stable for the process lifetime; resolve it once so the
+# hot path of _resolve_path works with plain strings instead of re-reading
+# the environment and allocating Path objects per call.
+_HOME = str(Path.home())
+_ONEDRIVE = os.path.join(_HOME, "OneDrive")
+
+# Roots probed by the fuzzy search; pure functions of the home directory,
+# so built once at import instead of per resolution.
+_SEARCH_ROOTS = (
+    os.path.join(_HOME, "Desktop"),
+    os.path.join(_HOME, "Documents"),
+    os.path.join(_ONEDRIVE, "Desktop"),
+    os.path.join(_ONEDRIVE, "Documents"),
+)
+
+# Map keywords to standard folder names. Hoisted to module level so
+# _resolve_path does O(1) dict lookups per input token instead of
+# rebuilding the map and substring-scanning every key on each call.
+_KEY_MAP = {
+    "download": "Downloads",
+    "downloads": "Downloads",
+    "doc": "Documents",
+    "docs": "Documents",
+    "document": "Documents",
+    "documents": "Documents",
+    "pic": "Pictures",
+    "pics": "Pictures",
+    "picture": "Pictures",
+    "pictures": "Pictures",
+    "vid": "Videos",
+    "video": "Videos",
+    "videos": "Videos",
+    "mus": "Music",
+    "music": "Music",
+    "desk": "Desktop",
+    "desktop": "Desktop",
+}
+
+
+# Directory names skipped by get_file_layout; frozenset membership beats
+# rebuilding a list literal per entry in the tree walk.
+_IGNORED_NAMES = frozenset({"node_modules", "__pycache__", "venv", ".git"})
+
+# Caps for get_file_layout: entries shown per directory, and total nodes
+# across the whole tree. Beyond either limit the tree reports that it was
+# truncated rather than materializing every entry.
+_MAX_TREE_CHILDREN = 1000
+_MAX_TREE_NODES = 10000
+
+# Candidate-existence answers change rarely but are probed several times
+# per resolution; memoize them briefly so repeated resolutions of the same
+# folders do not re-stat the filesystem.
+_EXISTS_TTL = 30.0  # seconds
+_exists_cache = {}
+
+
+def _path_exists(path: str) -> bool:
+    """os.path.exists with a short-lived memo (one os.stat per candidate)"""
+    now = time.monotonic()
+    cached = _exists_cache.get(path)
+    if cached and cached[0] > now:
+        return cached[1]
+    try:
+        os.stat(path)
+        exists = True
+    except OSError:
+        exists = False
+    _exists_cache[path] = (now + _EXISTS_TTL, exists)
+    return exists
+
+
+# Canonical folder names, for callers that want to recognize an
+# already-proper name without going through the keyword map.
+_STANDARD_FOLDERS = frozenset(_KEY_MAP.values())
+
+# Standard folders are probed once and the surviving locations (home or
+# OneDrive variant) cached, so keyword resolutions cost zero syscalls.
+# Refreshed hourly in case OneDrive mounts after startup.
+_STANDARD_TTL = 3600.0  # seconds
+_standard_dirs = {}
+_standard_expiry = 0.0
+
+
+def _resolved_standard(real_name: str) -> Optional[str]:
+    """Existing location of a standard folder, from the cached table"""
+    global _standard_expiry
+    now = time.monotonic()
+    if now >= _standard_expiry:
+        _standard_dirs.clear()
+        for name in _STANDARD_FOLDERS:
+            for base in (_HOME, _ONEDRIVE):
+                path = os.path.join(base, name)
+                if os.path.isdir(path):
+                    _standard_dirs[name] = path
+                    break
+        _standard_expiry = now + _STANDARD_TTL
+    return _standard_dirs.get(real_name)
+
+
+def _keyword_folder(lower_input: str) -> Optional[str]:
+    """Resolve a keyword like 'downloads' to its standard folder name"""
+    # Fastest path: the whole input is a single keyword (no split() needed)
+    real_name = _KEY_MAP.get(lower_input)
+    if real_name:
+        return real_name
+    # Fast path: exact token lookup
+    for token in lower_input.split():
+        real_name = _KEY_MAP.get(token)
+        if real_name:
+            return real_name
+    # Fallback: substring scan for inputs like 'downloadsfolder'
+    for key, real_name in _KEY_MAP.items():
+        if key in lower_input:
+            return real_name
+    return None
+
+
+# Resolved paths are memoized with a TTL rather than a plain lru_cache:
+# back-to-back tool calls on the same phrase skip all candidate stats, but
+# entries age out so newly created folders are picked up within 30 s.
+_RESOLVE_TTL = 30.0  # seconds
+_RESOLVE_MAX = 256
+_resolve_cache = {}
+_resolve_lock = threading.Lock()
+
+
+def _invalidate_path_caches():
+    """Drop memoized resolutions/existence answers after we create folders"""
+    global _standard_expiry
+    with _resolve_lock:
+        _resolve_cache.clear()
+    _exists_cache.clear()
+    _standard_expiry = 0.0
 
 
 def _resolve_path(path_str: str, allow_creation=False) -> str:
+    """Memoized front-end for _resolve_path_uncached (TTL per key).
+
+    The same phrases ("downloads", "my documents") are resolved over and
+    over by the chatbot; each uncached resolution costs several stat calls.
+    """
+    # Fast path: an already-canonical absolute directory needs no input
+    # cleaning, keyword mapping or cache bookkeeping — a single isdir
+    # syscall settles it.
+    if path_str and os.path.isabs(path_str) and os.path.isdir(path_str):
+        return os.path.realpath(path_str)
+
+    key = (path_str.casefold() if path_str else path_str, allow_creation)
+    now = time.monotonic()
+    with _resolve_lock:
+        hit = _resolve_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+
+    result = _resolve_path_uncached(path_str, allow_creation)
+
+    with _resolve_lock:
+        if len(_resolve_cache) >= _RESOLVE_MAX:
+            _resolve_cache.clear()
+        _resolve_cache[key] = (now + _RESOLVE_TTL, result)
+    return result
+
+
+def _resolve_path_uncached(path_str: str, allow_creation=False) -> str:
     """
     Smartly resolve paths from keywords.
     Prioritizes existing system folders (Pictures, Downloads) over creating new ones.
@@ -38,78 +236,206 @@ def _resolve_path(path_str: str, allow_creation=False) -> str:
     lower_input = clean_name.lower()
 
     # 1. Check absolute path
-    path_obj = Path(clean_name)
-    if path_obj.is_absolute() and path_obj.exists():
-        return str(path_obj.resolve())
+    if os.path.isabs(clean_name):
+        if _path_exists(clean_name):
+            return os.path.realpath(clean_name)
+        # A mistyped absolute path should not fall through to keyword
+        # guessing ("I found this in Pictures"); create it or give up.
+        return os.path.realpath(clean_name) if allow_creation else None
 
     # 2. Check Standard User Directories (The "Big 7")
-    home = Path.home()
-
-    # Check both standard and OneDrive variations
+    # If input matches a keyword, answer from the precomputed table of
+    # standard-folder locations: no per-call Path arithmetic or stats.
+    # Inputs containing a separator are relative paths, never bare keywords.
+    has_sep = os.sep in clean_name or (os.altsep and os.altsep in clean_name)
+    real_name = None if has_sep else _keyword_folder(lower_input)
+    if real_name:
+        standard = _resolved_standard(real_name)
+        if standard:
+            return os.path.realpath(standard)
+
+    # Check both standard and OneDrive variations of the literal input
     candidates = [
-        home / clean_name,  # C:/Users/Name/Input
-        home / "OneDrive" / clean_name,  # C:/Users/Name/OneDrive/Input
+        os.path.join(_HOME, clean_name),  # C:/Users/Name/Input
+        os.path.join(_ONEDRIVE, clean_name),  # C:/Users/Name/OneDrive/Input
     ]
-
-    # Map keywords to folder names
-    key_map = {
-        "download": "Downloads",
-        "downloads": "Downloads",
-        "doc": "Documents",
-        "docs": "Documents",
-        "document": "Documents",
-        "documents": "Documents",
-        "pic": "Pictures",
-        "pics": "Pictures",
-        "picture": "Pictures",
-        "pictures": "Pictures",
-        "vid": "Videos",
-        "video": "Videos",
-        "videos": "Videos",
-        "mus": "Music",
-        "music": "Music",
-        "desk": "Desktop",
-        "desktop": "Desktop",
-    }
-
-    # If input matches a keyword, add the proper casing to candidates
-    for key, real_name in key_map.items():
-        if key in lower_input:
-            candidates.append(home / real_name)
-            candidates.append(home / "OneDrive" / real_name)
-            break
-
-    # Check if any candidate exists
     for candidate in candidates:
-        if candidate.exists():
-            return str(candidate.resolve())
+        if _path_exists(candidate):
+            return os.path.realpath(candidate)
 
     # 3. Fuzzy Search in Roots (only if not found above)
-    search_roots = [
-        home / "Desktop",
-        home / "Documents",
-        home / "OneDrive" / "Desktop",
-        home / "OneDrive" / "Documents",
-    ]
-
-    for root in search_roots:
-        if root.exists():
+    for root in _SEARCH_ROOTS:
+        if _path_exists(root):
             try:
-                potential = root / clean_name
-                if potential.exists():
-                    return str(potential.resolve())
-            except:
-                pass
+                potential = os.path.join(root, clean_name)
+                if _path_exists(potential):
+                    return os.path.realpath(potential)
+            except OSError as e:
+                logger.debug(f"Fuzzy search skipped {root}: {e}")
 
     # 4. Creation / Fallback logic
     if allow_creation:
         # Default to C:/Users/Name/NewFolder
-        target = home / clean_name
-        return str(target.resolve())
+        return os.path.realpath(os.path.join(_HOME, clean_name))
 
     return None
 
 
+# Active processing jobs: folder_id -> list of files merged in while the
+# job runs. Bursts of requests for the same folder coalesce into the
+# running job instead of spawning overlapping threads that fight over the
+# same disk and pipeline.
+_active_jobs = {}
+# Completion callbacks for running jobs (folder_id -> list), guarded by
+# the same lock; merged requests append theirs rather than losing it.
+_job_callbacks = {}
+_active_jobs_lock = threading.Lock()
+
+# How many per-file results to accumulate locally before flushing them to
+# the shared progress dict that status endpoints poll.
+_PROGRESS_FLUSH_EVERY = 32
+
+# Shared pool for background jobs. A chain of tool calls across different
+# folders queues here instead of spawning an unbounded number of threads,
+# each with its own MAX_WORKERS pool contending for the same disk.
+_JOB_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="processing-job")
+
+
+def start_processing_job(files: List[str], folder_id, by_type: Dict = None,
+                         on_complete=None) -> bool:
+    """Start background processing for a folder, coalescing bursts.
+
+    If a job for this folder is already running, the files are merged into
+    its pending queue and the progress totals extended; otherwise progress
+    is initialized and a fresh worker thread is spawned. Returns True when
+    a new job was started, False when merged. on_complete, if given, runs
+    on the job thread once the job (including any merged work) drains;
+    every merged request's callback is kept and run, not just the
+    starter's.
+    """
+    with _active_jobs_lock:
+        pending = _active_jobs.get(folder_id)
+        if pending is not None:
+            pending.extend(files)
+            if on_complete is not None:
+                _job_callbacks.setdefault(folder_id, []).append(on_complete)
+            progress = state.processing_progress.get(folder_id)
+            if progress:
+                progress["total"] += len(files)
+                if by_type:
+                    merged = progress.setdefault("by_type", {})
+                    for file_type, count in by_type.items():
+                        merged[file_type] = merged.get(file_type, 0) + count
+            logger.info(
+                f"Merged {len(files)} files into running job for folder {folder_id}"
+            )
+            return False
+        _active_jobs[folder_id] = []
+        if on_complete is not None:
+            _job_callbacks[folder_id] = [on_complete]
+
+    state.processing_progress[folder_id] = {
+        "total": len(files),
+        "completed": 0,
+        "failed": 0,
+        "in_progress": 0,
+        "by_type": by_type or {},
+    }
+    _JOB_POOL.submit(run_processing_job, files, folder_id)
+    return True
+
+
+def run_processing_job(files: List[str], folder_id):
+    """Run a folder's files through the worker pool (background thread body).
+
+    Progress counters are updated under a single lock-protected struct so
+    concurrent result handling can never lose an increment. After each
+    batch, work merged in by start_processing_job is drained before the
+    job retires.
+    """
+    with _active_jobs_lock:
+        _active_jobs.setdefault(folder_id, [])
+    progress = state.processing_progress[folder_id]
+    progress_lock = threading.Lock()
+    logger.info(
+        f"Background processing started for {len(files)} files with {MAX_WORKERS} workers"
+    )
+    batch = list(files)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # The drain/retire step must run even when the first batch is
+        # empty, or the _active_jobs entry registered for this job would
+        # outlive it and swallow every later request for the folder.
+        while True:
+            future_to_file = {
+                executor.submit(process_file, file_path, folder_id): file_path
+                for file_path in batch
+            }
+            # Tally results in locals and flush to the shared progress dict
+            # every few files; status-endpoint readers poll it concurrently,
+            # and per-file writes just bounce that dict between threads.
+            completed = failed = pending_flush = 0
+            for future in as_completed(future_to_file):
+                file_path = future_to_file[future]
+                try:
+                    res = future.result()
+                    succeeded = res.get("status") == "success"
+                except Exception as e:
+                    logger.error(f"Error processing {file_path}: {e}")
+                    succeeded = False
+                if succeeded:
+                    completed += 1
+                else:
+                    failed += 1
+                pending_flush += 1
+                if pending_flush >= _PROGRESS_FLUSH_EVERY:
+                    with progress_lock:
+                        progress["completed"] += completed
+                        progress["failed"] += failed
+                    completed = failed = pending_flush = 0
+            with progress_lock:
+                progress["completed"] += completed
+                progress["failed"] += failed
+
+            with _active_jobs_lock:
+                batch = _active_jobs.get(folder_id) or []
+                if not batch:
+                    _active_jobs.pop(folder_id, None)
+                    # Popped under the same lock as the job entry, so a
+                    # request arriving after this point starts a fresh job
+                    # that owns its own callbacks.
+                    callbacks = _job_callbacks.pop(folder_id, [])
+                    break
+                _active_jobs[folder_id] = []
+
+    state.save_to_disk()
+    logger.info(
+        f"Processing complete. Completed: {progress['completed']}, Failed: {progress['failed']}"
+    )
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Job completion callback failed: {e}")
+
+
+def _scan_folder_files(folder_path: Path):
+    """Enumerate a folder's files and classify them in one scandir pass.
+
+    Returns (files, by_type): the work list plus a per-type breakdown for
+    the progress dict, without issuing extra stat() calls per entry.
+    """
+    files = []
+    by_type = {}
+    with os.scandir(str(folder_path)) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                files.append(entry.path)
+                ext = os.path.splitext(entry.name)[1].lower()
+                file_type = MultiModalExtractor._detect_type(ext)
+                by_type[file_type] = by_type.get(file_type, 0) + 1
+    return files, by_type
+
+
 def create_category(name: str, path: str):
     """Create a new organization category"""
     try:
@@ -133,36 +459,33 @@ def create_category(name: str, path: str):
         if not path_obj.exists():
             try:
                 path_obj.mkdir(parents=True, exist_ok=True)
+                _invalidate_path_caches()
                 logger.info(f"Created category directory: {path_obj}")
             except Exception as e:
                 logger.error(f"Failed to create category directory: {e}")
                 return f"Error: Could not create folder {final_path}: {e}"
 
         # Check duplicates
-        if any(c["name"].lower() == name.lower() for c in state.categories):
+        if name.lower() in state.category_names:
             logger.warning(f"Category '{name}' already exists")
             return f"Error: Category '{name}' already exists."
 
         new_category = {
             "id": len(state.categories) + 1,
             "name": name,
-            "path": str(path_obj),
+            "path": final_path,
             "color": "bg-blue-500",
             "rules": 0,
         }
 
         state.categories.append(new_category)
+        state.rebuild_indexes()
         logger.info(
             f"Added category to state. Total categories: {len(state.categories)}"
         )
 
-        try:
-            state.save_to_disk()
-            logger.info("State saved successfully")
-        except Exception as e:
-            logger.error(f"Failed to save state: {e}")
-            state.categories.remove(new_category)
-            return f"Error: Could not save configuration: {str(e)}"
+        # Coalesced background save; the request thread doesn't block on disk
+        state.save_to_disk_async()
 
         return f"Success: Created category '{name}' at {path_obj}"
 
@@ -207,6 +530,7 @@ def create_folder(path: str, folder_name: str = None):
 
         try:
             full_path.mkdir(parents=True, exist_ok=True)
+            _invalidate_path_caches()
             logger.info(f"Successfully created folder: {full_path}")
         except Exception as e:
             logger.error(f"Failed to create folder: {e}")
@@ -243,12 +567,9 @@ def add_watched_folder(path: str):
             return f"Error: Path is not a directory: {path_obj}"
 
         # Check duplicates
-        norm_new = os.path.normpath(str(path_obj)).lower()
-        for f in state.watched_folders:
-            norm_existing = os.path.normpath(f["path"]).lower()
-            if norm_existing == norm_new:
-                logger.info(f"Folder already watched: {path_obj.name}")
-                return f"Info: Folder '{path_obj.name}' is already being watched."
+        if state.normalize_path(path_obj) in state.watched_paths:
+            logger.info(f"Folder already watched: {path_obj.name}")
+            return f"Info: Folder '{path_obj.name}' is already being watched."
 
         new_folder = {
             "id": len(state.watched_folders) + 1,
@@ -264,17 +585,13 @@ def add_watched_folder(path: str):
 
         # Add to state
         state.watched_folders.append(new_folder)
+        state.rebuild_indexes()
         logger.info(
             f"Added to state. Total watched folders: {len(state.watched_folders)}"
         )
 
-        # Save to disk
-        try:
-            state.save_to_disk()
-            logger.info("State saved to disk successfully")
-        except Exception as e:
-            logger.error(f"Failed to save state to disk: {e}")
-            return f"Error: Could not save configuration: {str(e)}"
+        # Coalesced background save; the request thread doesn't block on disk
+        state.save_to_disk_async()
 
         # Start watching
         try:
@@ -284,6 +601,7 @@ def add_watched_folder(path: str):
             logger.error(f"Failed to start watching: {e}")
             # Remove from state if watching failed
             state.watched_folders.remove(new_folder)
+            state.rebuild_indexes()
             state.save_to_disk()
             return f"Error: Could not start file watcher: {str(e)}"
 
@@ -304,13 +622,21 @@ def sort_folder(folder_name: str):
             logger.warning("No categories configured - cannot organize files")
             return "Error: You need to create at least one category first. Categories are destination folders where your files will be organized. Try: 'Make a category called Work in Documents'"
 
-        target = None
-
-        # Try finding by name
-        for f in state.watched_folders:
-            if folder_name.lower() in f["name"].lower():
-                target = f
-                break
+        # Try finding by name: exact index hit first, then prefix, then
+        # substring — all against the pre-lowered name index, so the
+        # fallback scans never re-lowercase each folder name per call.
+        name_lower = folder_name.lower()
+        target = state.folders_by_name.get(name_lower)
+        if not target:
+            for lowered, f in state.folders_by_name.items():
+                if lowered.startswith(name_lower):
+                    target = f
+                    break
+        if not target:
+            for lowered, f in state.folders_by_name.items():
+                if name_lower in lowered:
+                    target = f
+                    break
 
         if not target:
             logger.warning(f"Folder '{folder_name}' not in watched list")
@@ -325,37 +651,13 @@ def sort_folder(folder_name: str):
             logger.error(f"Folder path does not exist: {folder_path}")
             return "Error: Folder path not found on disk."
 
-        files = [str(f) for f in folder_path.iterdir() if f.is_file()]
-        logger.info(f"Found {len(files)} files to process")
+        files, by_type = _scan_folder_files(folder_path)
+        logger.info(f"Found {len(files)} files to process: {by_type}")
 
         if not files:
             return f"Folder '{target['name']}' is empty."
 
-        state.processing_progress[folder_id] = {
-            "total": len(files),
-            "completed": 0,
-            "failed": 0,
-            "in_progress": 0,
-        }
-
-        def _process():
-            logger.info(f"Starting processing thread for {len(files)} files")
-            for file_path in files:
-                try:
-                    res = process_file(file_path, folder_id)
-                    if res.get("status") == "success":
-                        state.processing_progress[folder_id]["completed"] += 1
-                    else:
-                        state.processing_progress[folder_id]["failed"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {e}")
-                    state.processing_progress[folder_id]["failed"] += 1
-            state.save_to_disk()
-            logger.info(
-                f"Processing complete. Completed: {state.processing_progress[folder_id]['completed']}, Failed: {state.processing_progress[folder_id]['failed']}"
-            )
-
-        threading.Thread(target=_process, daemon=True).start()
+        start_processing_job(files, folder_id, by_type)
 
         return f"Success: Started processing {len(files)} files in '{target['name']}'. Files will be organized into your categories: {', '.join([c['name'] for c in state.categories])}."
 
@@ -395,24 +697,17 @@ def process_folder(path: str, confirmed: bool = False):
         if not folder_path.is_dir():
             return f"Error: Path is not a folder: {folder_path}"
 
-        # Check if it's a watched folder
-        is_watched = False
-        watched_folder_id = None
-
-        norm_target = os.path.normpath(str(folder_path)).lower()
-        for f in state.watched_folders:
-            norm_watched = os.path.normpath(f["path"]).lower()
-            if norm_watched == norm_target:
-                is_watched = True
-                watched_folder_id = f["id"]
-                break
+        # Check if it's a watched folder (O(1) index lookup)
+        watched = state.folders_by_path.get(state.normalize_path(folder_path))
+        is_watched = watched is not None
+        watched_folder_id = watched["id"] if watched else None
 
         logger.info(f"Is watched folder: {is_watched}")
 
-        # Count files
-        files = [str(f) for f in folder_path.iterdir() if f.is_file()]
+        # Count and classify files in a single pass
+        files, by_type = _scan_folder_files(folder_path)
         file_count = len(files)
-        logger.info(f"Found {file_count} files")
+        logger.info(f"Found {file_count} files: {by_type}")
 
         if file_count == 0:
             return f"Folder '{folder_path.name}' is empty - no files to process."
@@ -421,18 +716,22 @@ def process_folder(path: str, confirmed: bool = False):
         if is_watched:
             logger.info("Processing watched folder immediately")
             return _start_processing(
-                folder_path, watched_folder_id, files, is_watched=True
+                folder_path, watched_folder_id, files, is_watched=True, by_type=by_type
             )
 
         # For non-watched folders, require confirmation
         if not confirmed:
-            # Store the pending request
-            confirmation_id = str(hash(str(folder_path)))
-            pending_confirmations[confirmation_id] = {
-                "path": str(folder_path),
-                "files": files,
-                "file_count": file_count,
-            }
+            # Store the pending request under an unguessable, collision-free ID
+            confirmation_id = secrets.token_urlsafe(16)
+            _pending_put(
+                confirmation_id,
+                {
+                    "path": str(folder_path),
+                    "files": files,
+                    "file_count": file_count,
+                    "by_type": by_type,
+                },
+            )
 
             logger.info(f"Confirmation required. ID: {confirmation_id}")
 
@@ -441,7 +740,7 @@ def process_folder(path: str, confirmed: bool = False):
 
         # User has confirmed, process the folder
         logger.info("Processing non-watched folder with confirmation")
-        return _start_processing(folder_path, None, files, is_watched=False)
+        return _start_processing(folder_path, None, files, is_watched=False, by_type=by_type)
 
     except Exception as e:
         logger.error(f"Error in process_folder: {e}", exc_info=True)
@@ -457,27 +756,25 @@ def confirm_process_folder(confirmation_id: str, confirmed: bool):
             f"confirm_process_folder called - ID: {confirmation_id}, confirmed: {confirmed}"
         )
 
-        if confirmation_id not in pending_confirmations:
-            logger.warning(f"Confirmation ID not found: {confirmation_id}")
+        pending = _pending_pop(confirmation_id)
+        if pending is None:
+            logger.warning(f"Confirmation ID not found or expired: {confirmation_id}")
             return "Error: No pending confirmation found. The request may have expired."
 
         if not confirmed:
-            # User cancelled
-            del pending_confirmations[confirmation_id]
+            # User cancelled; the entry is already removed
             logger.info("User cancelled processing")
             return "Cancelled: Folder processing cancelled."
 
         # User confirmed, proceed with processing
-        pending = pending_confirmations[confirmation_id]
         folder_path = Path(pending["path"])
         files = pending["files"]
 
         logger.info(f"User confirmed. Processing {len(files)} files from {folder_path}")
 
-        # Clean up confirmation
-        del pending_confirmations[confirmation_id]
-
-        return _start_processing(folder_path, None, files, is_watched=False)
+        return _start_processing(
+            folder_path, None, files, is_watched=False, by_type=pending.get("by_type")
+        )
 
     except Exception as e:
         logger.error(f"Error in confirm_process_folder: {e}", exc_info=True)
@@ -485,7 +782,11 @@ def confirm_process_folder(confirmation_id: str, confirmed: bool):
 
 
 def _start_processing(
-    folder_path: Path, folder_id: Optional[int], files: List[str], is_watched: bool
+    folder_path: Path,
+    folder_id: Optional[int],
+    files: List[str],
+    is_watched: bool,
+    by_type: Optional[Dict] = None,
 ):
     """
     Internal function to start processing files.
@@ -495,41 +796,17 @@ def _start_processing(
             f"_start_processing - folder: {folder_path}, is_watched: {is_watched}, files: {len(files)}"
         )
 
-        # If not watched, create a temporary ID
+        # If not watched, create a temporary ID. hash() is randomized per
+        # process and collides across folders; a random token is unique and
+        # cheap (no hashing of the path string at all).
         if folder_id is None:
-            folder_id = f"temp_{hash(str(folder_path))}"
+            folder_id = f"temp_{secrets.token_hex(8)}"
             logger.info(f"Created temp folder ID: {folder_id}")
 
         file_count = len(files)
 
-        # Initialize progress tracking
-        state.processing_progress[folder_id] = {
-            "total": file_count,
-            "completed": 0,
-            "failed": 0,
-            "in_progress": 0,
-        }
-
-        def _process():
-            logger.info(f"Background processing started for {file_count} files")
-            for file_path in files:
-                try:
-                    res = process_file(file_path, folder_id)
-                    if res.get("status") == "success":
-                        state.processing_progress[folder_id]["completed"] += 1
-                    else:
-                        state.processing_progress[folder_id]["failed"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {e}")
-                    state.processing_progress[folder_id]["failed"] += 1
-
-            state.save_to_disk()
-            logger.info(
-                f"Background processing complete. Completed: {state.processing_progress[folder_id]['completed']}, Failed: {state.processing_progress[folder_id]['failed']}"
-            )
-
-        # Start processing in background thread
-        threading.Thread(target=_process, daemon=True).start()
+        # Start in background (or merge into a job already running)
+        start_processing_job(files, folder_id, by_type)
 
         folder_type = "watched folder" if is_watched else "folder"
         return f"Success: Started processing {file_count} files in {folder_type} '{folder_path.name}'."
@@ -539,6 +816,102 @@ def _start_processing(
         return f"Error starting processing: {str(e)}"
 
 
+# Inverted index over RAG files (token -> RAG filenames). Entries are keyed
+# by mtime so unchanged files are never re-parsed between searches.
+_rag_index_lock = threading.Lock()
+_rag_index_files = {}  # rag filename -> {"mtime", "tokens", "summary", "file"}
+_rag_index_tokens = {}  # token -> set of rag filenames
+
+
+def _index_rag_file(rag_file: Path, mtime: float) -> Optional[Dict]:
+    """Parse one RAG file into an index entry (tokens + display fields).
+
+    Only summary/content/original_file are needed; with ijson installed the
+    document is streamed and parsing stops as soon as those fields are seen,
+    instead of materializing the whole JSON tree.
+    """
+    summary = content = ""
+    file_name = rag_file.stem
+    try:
+        if HAS_IJSON:
+            with open(rag_file, "rb") as f:
+                remaining = 3
+                for key, value in ijson.kvitems(f, ""):
+                    if key == "summary":
+                        summary = value
+                    elif key == "content":
+                        content = value
+                    elif key == "original_file":
+                        file_name = value or file_name
+                    else:
+                        continue
+                    remaining -= 1
+                    if remaining == 0:
+                        break  # short-circuit: skip the rest of the document
+        else:
+            with open(rag_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            summary = data.get("summary", "")
+            content = data.get("content", "")
+            file_name = data.get("original_file", file_name)
+
+        # RAG documents from RAGGenerator nest these as objects, not
+        # strings; only index what is actually free text.
+        if not isinstance(summary, str):
+            summary = ""
+        if not isinstance(content, str):
+            content = ""
+
+        return {
+            "mtime": mtime,
+            "tokens": set(summary.lower().split()) | set(content.lower().split()),
+            "summary": (summary or "No summary")[:200],
+            "file": file_name,
+        }
+    except Exception as e:
+        logger.error(f"Error reading RAG file {rag_file}: {e}")
+        return None
+
+
+def _refresh_rag_index(rag_dir: Path):
+    """Sync the inverted index with the RAG directory (caller holds the lock).
+
+    Unchanged files keep their cached token sets; new or modified files are
+    re-parsed and deleted files are dropped from the postings.
+    """
+    seen = set()
+    for rag_file in rag_dir.glob("*.rag.json"):
+        name = rag_file.name
+        try:
+            mtime = rag_file.stat().st_mtime
+        except OSError:
+            continue
+        seen.add(name)
+
+        old_entry = _rag_index_files.get(name)
+        if old_entry and old_entry["mtime"] == mtime:
+            continue
+
+        entry = _index_rag_file(rag_file, mtime)
+        if old_entry:
+            for token in old_entry["tokens"]:
+                _rag_index_tokens.get(token, set()).discard(name)
+        if entry is None:
+            _rag_index_files.pop(name, None)
+            continue
+
+        _rag_index_files[name] = entry
+        for token in entry["tokens"]:
+            _rag_index_tokens.setdefault(token, set()).add(name)
+
+    # Drop postings for files deleted from disk
+    for name in list(_rag_index_files):
+        if name not in seen:
+            for token in _rag_index_files[name]["tokens"]:
+                _rag_index_tokens.get(token, set()).discard(name)
+            del _rag_index_files[name]
+
+
 def search_rag_data(query: str, max_results: int = 5) -> str:
     """
     Search through RAG data to answer questions about processed files.
@@ -555,42 +928,28 @@ def search_rag_data(query: str, max_results: int = 5) -> str:
             logger.warning("RAG directory does not exist")
             return "No RAG data available. Process some files first."
 
-        results = []
         query_lower = query.lower()
 
-        # Search through all RAG files
-        rag_files = list(rag_dir.glob("*.rag.json"))
-        logger.info(f"Searching through {len(rag_files)} RAG files")
-
-        for rag_file in rag_files:
-            try:
-                with open(rag_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # Search in summary and content
-                summary = data.get("summary", "").lower()
-                content = data.get("content", "").lower()
-                file_name = data.get("original_file", rag_file.stem)
-
-                # Simple keyword matching
-                if any(
-                    word in summary or word in content for word in query_lower.split()
-                ):
-                    results.append(
-                        {
-                            "file": file_name,
-                            "summary": data.get("summary", "No summary")[:200],
-                            "relevance": sum(
-                                1
-                                for word in query_lower.split()
-                                if word in summary or word in content
-                            ),
-                        }
-                    )
-
-            except Exception as e:
-                logger.error(f"Error reading RAG file {rag_file}: {e}")
-                continue
+        with _rag_index_lock:
+            _refresh_rag_index(rag_dir)
+            logger.info(f"Searching index of {len(_rag_index_files)} RAG files")
+
+            # Relevance = number of distinct query words whose postings
+            # contain the file; deduping keeps repeated words from walking
+            # (and counting) the same posting list twice.
+            scores = {}
+            for word in set(query_lower.split()):
+                for name in _rag_index_tokens.get(word, ()):
+                    scores[name] = scores.get(name, 0) + 1
+
+            results = [
+                {
+                    "file": _rag_index_files[name]["file"],
+                    "summary": _rag_index_files[name]["summary"],
+                    "relevance": score,
+                }
+                for name, score in scores.items()
+            ]
 
         # Sort by relevance and limit
         results.sort(key=lambda x: x["relevance"], reverse=True)
@@ -635,57 +994,110 @@ def get_file_layout(path: str = None, depth: int = 2) -> str:
         if not target_path.exists():
             return f"Error: Path does not exist: {target_path}"
 
-        def build_tree(
-            current_path: Path, current_depth: int = 0, prefix: str = ""
-        ) -> List[str]:
-            """Recursively build a tree structure"""
-            if current_depth > depth:
-                return []
+        def scan_children(dir_path: str):
+            """List, filter and sort one directory with a single scandir pass.
+
+            Huge directories (Downloads with 100k files) are never fully
+            materialized: a bounded heap keeps only the first
+            _MAX_TREE_CHILDREN entries in sort order and the rest are
+            counted so the tree can say how much was omitted.
+            """
+            total = 0
+
+            def visible():
+                nonlocal total
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        # Slice compare beats a bound-method call per entry
+                        if name[:1] == "." or name in _IGNORED_NAMES:
+                            continue
+                        total += 1
+                        yield entry
+
+            children = heapq.nsmallest(
+                _MAX_TREE_CHILDREN,
+                visible(),
+                key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower()),
+            )
+            return children, total - len(children)
 
-            lines = []
-            try:
-                items = sorted(
-                    current_path.iterdir(),
-                    key=lambda x: (not x.is_dir(), x.name.lower()),
-                )
-
-                # Filter out hidden files and common ignore patterns
-                items = [
-                    item
-                    for item in items
-                    if not item.name.startswith(".")
-                    and item.name not in ["node_modules", "__pycache__", "venv", ".git"]
-                ]
-
-                for i, item in enumerate(items):
-                    is_last = i == len(items) - 1
-                    connector = "└── " if is_last else "├── "
-
-                    # Add file size for files
-                    if item.is_file():
-                        size = item.stat().st_size
-                        size_str = f" ({_format_size(size)})"
-                        lines.append(f"{prefix}{connector}{item.name}{size_str}")
-                    else:
-                        lines.append(f"{prefix}{connector}{item.name}/")
-
-                        # Recurse into directories
-                        if current_depth < depth:
-                            extension = "    " if is_last else "│   "
-                            lines.extend(
-                                build_tree(item, current_depth + 1, prefix + extension)
-                            )
+        def build_tree(root: Path):
+            """Yield tree lines iteratively with an explicit stack (no recursion).
 
+            DirEntry.is_file/stat reuse the data from the directory read, so
+            no extra stat() syscall is issued per entry. Generating lazily
+            means no intermediate list of every line is held alongside the
+            joined result.
+            """
+            try:
+                children, skipped = scan_children(str(root))
             except PermissionError:
-                lines.append(f"{prefix}└── [Permission Denied]")
-
-            return lines
+                yield "└── [Permission Denied]"
+                return
+
+            # Children are pushed in reverse so pop order matches the
+            # pre-order output of the old recursive version. A None entry
+            # is an overflow marker; its is_last slot holds the count.
+            stack = [
+                (entry, 0, "", i == len(children) - 1 and not skipped)
+                for i, entry in reversed(list(enumerate(children)))
+            ]
+            if skipped:
+                stack.insert(0, (None, 0, "", skipped))
+
+            nodes = 0
+            while stack:
+                entry, current_depth, prefix, is_last = stack.pop()
+                if entry is None:
+                    yield f"{prefix}└── ... ({is_last} more entries)"
+                    continue
+                nodes += 1
+                if nodes > _MAX_TREE_NODES:
+                    yield f"... (tree truncated at {_MAX_TREE_NODES} entries)"
+                    return
+                connector = "└── " if is_last else "├── "
+
+                # Add file size for files
+                if entry.is_file(follow_symlinks=False):
+                    size = entry.stat(follow_symlinks=False).st_size
+                    size_str = f" ({_format_size(size)})"
+                    yield f"{prefix}{connector}{entry.name}{size_str}"
+                else:
+                    yield f"{prefix}{connector}{entry.name}/"
+
+                    # Descend into directories
+                    if current_depth < depth:
+                        # Built once per directory and shared by reference:
+                        # pushing it per child would redo an O(depth)
+                        # concatenation for every entry.
+                        child_prefix = prefix + ("    " if is_last else "│   ")
+                        try:
+                            children, skipped = scan_children(entry.path)
+                        except PermissionError:
+                            yield f"{child_prefix}└── [Permission Denied]"
+                            continue
+                        # Marker goes on first so it pops after the children
+                        if skipped:
+                            stack.append(
+                                (None, current_depth + 1, child_prefix, skipped)
+                            )
+                        stack.extend(
+                            (
+                                child,
+                                current_depth + 1,
+                                child_prefix,
+                                i == len(children) - 1 and not skipped,
+                            )
+                            for i, child in reversed(list(enumerate(children)))
+                        )
 
-        tree_lines = [str(target_path) + "/"]
-        tree_lines.extend(build_tree(target_path))
+        def iter_lines():
+            yield str(target_path) + "/"
+            yield from build_tree(target_path)
 
-        result = "\n".join(tree_lines)
-        logger.info(f"Generated file layout with {len(tree_lines)} lines")
+        result = "\n".join(iter_lines())
+        logger.info(f"Generated file layout for {target_path}")
 
         return result
 
@@ -694,13 +1106,15 @@ def get_file_layout(path: str = None, depth: int = 2) -> str:
         return f"Error getting file layout: {str(e)}"
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def _format_size(size_bytes: int) -> str:
     """Format file size in human-readable format"""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # Pick the unit straight from the bit length (each unit step is 10 bits)
+    # instead of repeatedly dividing in a loop.
+    i = min((max(int(size_bytes), 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def list_categories() -> str:
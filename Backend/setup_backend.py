@@ -1,12 +1,12 @@
 """Fix models.py to handle Ollama API response correctly"""
 
+import sys
 from pathlib import Path
 
 backend_dir = Path(__file__).parent
 models_file = backend_dir / "file_organizer" / "models.py"
 
-with open(models_file, "r", encoding="utf-8") as f:
-    content = f.read()
+content = models_file.read_text(encoding="utf-8")
 
 # Replace the problematic line
 old_code = "model_names = [m['name'] for m in available_models['models']]"
@@ -22,10 +22,19 @@ new_code = """model_names = []
                 elif hasattr(m, 'model'):
                     model_names.append(m.model)"""
 
-content = content.replace(old_code, new_code)
+# Formatting-insensitive marker: the patched logic starts by building the
+# list empty, which the broken one-liner never does. A literal comparison
+# against new_code breaks as soon as a formatter rewrites the quotes.
+if "model_names = []" in content:
+    print("✅ models.py already patched, nothing to do")
+    sys.exit(0)
 
-with open(models_file, "w", encoding="utf-8") as f:
-    f.write(content)
+if old_code not in content:
+    print("❌ Could not find the code to patch in models.py — "
+          "it may have changed since this script was written")
+    sys.exit(1)
+
+models_file.write_text(content.replace(old_code, new_code), encoding="utf-8")
 
 print("✅ Fixed models.py")
 print("Restart your backend: python main.py")
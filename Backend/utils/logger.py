@@ -2,8 +2,15 @@
 Comprehensive Logging System with Colors and Rotation
 """
 
+import atexit
+import functools
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+import queue
+from logging.handlers import (
+    RotatingFileHandler, MemoryHandler, QueueHandler, QueueListener
+)
 from pathlib import Path
 import sys
 from config.settings import (
@@ -11,10 +18,148 @@ from config.settings import (
     MAX_LOG_SIZE, BACKUP_COUNT
 )
 
+# Emit failures (e.g. a log file vanishing) should not print tracebacks
+# from inside hot paths; handlers just drop the record instead.
+logging.raiseExceptions = False
+
+# Buffered file handlers and the background thread that drains them.
+# Buffering collapses bursts of INFO/DEBUG records into one write() per
+# batch; the flusher bounds how long a record can sit in memory.
+_FLUSH_INTERVAL = 1.0  # seconds
+_buffered_handlers = []
+_flusher_started = False
+_flusher_lock = threading.Lock()
+
+
+def _flush_buffers():
+    for handler in list(_buffered_handlers):
+        try:
+            handler.flush()
+        except Exception:
+            pass
+
+
+def _ensure_flusher():
+    global _flusher_started
+    with _flusher_lock:
+        if _flusher_started:
+            return
+        _flusher_started = True
+
+    def flush_loop():
+        while True:
+            time.sleep(_FLUSH_INTERVAL)
+            _flush_buffers()
+
+    threading.Thread(target=flush_loop, daemon=True).start()
+    atexit.register(_flush_buffers)
+
+
+# One queue + listener per log file (in practice just the default).
+# Loggers enqueue records with a lock-free put(); the single listener
+# thread does all formatting and disk I/O, so Flask request threads and
+# the watcher never serialize on a file handler's lock.
+_listeners = {}  # log filename -> queue
+_listener_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_logs_dir() -> Path:
+    """Create LOGS_DIR on first sink construction (one syscall per process)"""
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    return LOGS_DIR
+
+
+def _get_log_queue(log_filename: str):
+    """Queue feeding the shared sink handlers for one log file"""
+    with _listener_lock:
+        log_queue = _listeners.get(log_filename)
+        if log_queue is not None:
+            return log_queue
+
+        _ensure_logs_dir()
 
-class ColoredFormatter(logging.Formatter):
+        # validate=False skips the %-style format validation; LOG_FORMAT
+        # is a fixed configuration constant, not user input.
+        formatter = CachedTimeFormatter(
+            LOG_FORMAT, datefmt=LOG_DATE_FORMAT, validate=False
+        )
+        color_formatter = ColoredFormatter(
+            LOG_FORMAT, datefmt=LOG_DATE_FORMAT, validate=False
+        )
+
+        # 1. Console Handler (with colors)
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.DEBUG)
+        console_handler.setFormatter(color_formatter)
+
+        # 2. Main Rotating File Handler, buffered (see _ensure_flusher)
+        file_handler = RotatingFileHandler(
+            LOGS_DIR / log_filename,
+            maxBytes=MAX_LOG_SIZE,
+            backupCount=BACKUP_COUNT
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        buffered_handler = MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        _buffered_handlers.append(buffered_handler)
+        _ensure_flusher()
+
+        # 3. Error-only Handler (separate file, unbuffered)
+        error_handler = RotatingFileHandler(
+            LOGS_DIR / "errors.log",
+            maxBytes=MAX_LOG_SIZE,
+            backupCount=BACKUP_COUNT
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(
+            log_queue,
+            console_handler,
+            buffered_handler,
+            error_handler,
+            respect_handler_level=True,
+        )
+        listener.start()
+        atexit.register(listener.stop)
+
+        _listeners[log_filename] = log_queue
+        return log_queue
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted time within the same second.
+
+    formatTime costs a localtime + strftime per record; in a burst most
+    records fall in the same second, so one formatted string serves them
+    all. Milliseconds (only used when no datefmt is given) come from the
+    record itself and stay exact.
+    """
+
+    _time_cache = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        key = (int(record.created), datefmt)
+        cached_key, base = type(self)._time_cache
+        if cached_key != key:
+            ct = self.converter(record.created)
+            base = time.strftime(datefmt or self.default_time_format, ct)
+            type(self)._time_cache = (key, base)
+        if datefmt:
+            return base
+        return self.default_msec_format % (base, record.msecs)
+
+
+class ColoredFormatter(CachedTimeFormatter):
     """Add colors to console output"""
-    
+
     COLORS = {
         'DEBUG': '\033[36m',      # Cyan
         'INFO': '\033[32m',       # Green
@@ -23,11 +168,32 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': '\033[35m',   # Magenta
     }
     RESET = '\033[0m'
-    
+
+    # The five colored strings never change; build them once instead of
+    # two concatenations per record. (RESET spelled out: class-level names
+    # are not visible inside a class-body comprehension.)
+    _COLORED = {lvl: f"{color}{lvl}\033[0m" for lvl, color in COLORS.items()}
+
     def format(self, record):
-        log_color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{log_color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        original = record.levelname
+        record.levelname = self._COLORED.get(original, original)
+        try:
+            return super().format(record)
+        finally:
+            # The record is shared with the other handlers; leaving the
+            # ANSI codes on it would leak escape sequences into the files.
+            record.levelname = original
+
+
+_root_level_set = False
+
+
+def _ensure_root_level():
+    """Apply the configured default level to the root logger once"""
+    global _root_level_set
+    if not _root_level_set:
+        logging.getLogger().setLevel(LOG_LEVEL)
+        _root_level_set = True
 
 
 def setup_logger(name: str, log_file: str = None, level: str = None):
@@ -35,51 +201,24 @@ def setup_logger(name: str, log_file: str = None, level: str = None):
     Setup a comprehensive logger with multiple handlers
     """
     logger = logging.getLogger(name)
-    
-    # Set default level if not already set
+
+    # Leave the logger at NOTSET so it inherits the root level; that way
+    # update_log_level is one setLevel on root instead of a walk over
+    # every registered logger. Explicit per-logger levels still win.
     if level:
         logger.setLevel(level)
-    elif not logger.level:
-        logger.setLevel(LOG_LEVEL)
-    
+    else:
+        logger.setLevel(logging.NOTSET)
+        _ensure_root_level()
+
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
-    
-    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
-    color_formatter = ColoredFormatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
-    
-    # 1. Console Handler (with colors)
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG) # Allow all, let logger level control
-    console_handler.setFormatter(color_formatter)
-    logger.addHandler(console_handler)
-    
-    # 2. Main Rotating File Handler
-    if log_file:
-        file_path = LOGS_DIR / log_file
-    else:
-        file_path = LOGS_DIR / "leologic.log"
-    
-    file_handler = RotatingFileHandler(
-        file_path,
-        maxBytes=MAX_LOG_SIZE,
-        backupCount=BACKUP_COUNT
-    )
-    file_handler.setLevel(logging.DEBUG) # Allow all, let logger level control
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
-    # 3. Error-only Handler (separate file for errors)
-    error_handler = RotatingFileHandler(
-        LOGS_DIR / "errors.log",
-        maxBytes=MAX_LOG_SIZE,
-        backupCount=BACKUP_COUNT
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
-    logger.addHandler(error_handler)
-    
+
+    # Named loggers only enqueue; the shared listener thread owns the
+    # console/file/error sinks and does the formatting and I/O.
+    logger.addHandler(QueueHandler(_get_log_queue(log_file or "leologic.log")))
+
     return logger
 
 
@@ -98,36 +237,43 @@ def update_log_level(level_name: str):
     
     # Default to INFO if unknown
     new_level = level_map.get(level_name, logging.INFO)
-    
-    # Update root logger (affects all child loggers)
+
+    # All loggers from setup_logger sit at NOTSET and inherit from root,
+    # so one setLevel reaches every module — no loggerDict walk. Records
+    # below the level never reach the queue, so the sinks do no wasted
+    # formatting either.
     logging.getLogger().setLevel(new_level)
-    
-    # Specifically update file_organizer loggers if they were instantiated separately
-    loggers = [logging.getLogger(name) for name in logging.root.manager.loggerDict]
-    for logger in loggers:
-        logger.setLevel(new_level)
-        
+
     print(f"📝 Log level updated to: {logging.getLevelName(new_level)}")
 
 
 def log_performance(func):
     """Decorator to log function execution time"""
-    import time
     from functools import wraps
-    
+
+    # Resolved once at decoration time, not per call
+    logger = logging.getLogger(func.__module__)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger = logging.getLogger(func.__module__)
-        start = time.time()
-        
+        # Timing is only reported at DEBUG; skip the clock reads and
+        # message formatting entirely when that level is off.
+        if not logger.isEnabledFor(logging.DEBUG):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{func.__name__} failed: {e}")
+                raise
+
+        start = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
             logger.debug(f"{func.__name__} completed in {elapsed:.2f}s")
             return result
         except Exception as e:
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
             logger.error(f"{func.__name__} failed after {elapsed:.2f}s: {e}")
             raise
-    
+
     return wrapper
\ No newline at end of file
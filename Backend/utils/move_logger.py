@@ -2,109 +2,183 @@
 Move Logger - Tracks file movements and generates session reports
 """
 
+import io
+import os
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict
 from config.settings import MOVE_LOGS_DIR
 import json
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+class MoveRecord:
+    """One recorded file movement.
+
+    Fixed slots instead of a dict per move: sessions over thousands of
+    files keep every record in memory until the report is saved.
+    """
+
+    __slots__ = ("timestamp", "original_path", "destination_path", "filename",
+                 "category", "confidence", "summary", "formatted")
+
+    def __init__(self, original_path: str, destination_path: str, category: str,
+                 confidence: float, summary: str):
+        self.timestamp = datetime.now().isoformat()
+        self.original_path = original_path
+        self.destination_path = destination_path
+        self.filename = Path(original_path).name
+        self.category = category
+        self.confidence = confidence
+        self.summary = summary
+        # The report block (minus the list index, which depends on report
+        # order) is immutable; format it once here so repeated
+        # generate_report calls only prepend the index.
+        parts = [
+            f"{self.filename}\n",
+            f"      From: {original_path}\n",
+            f"      To:   {destination_path}\n",
+            f"      Confidence: {confidence:.1%}\n",
+        ]
+        if summary:
+            summary_short = summary[:100] + "..." if len(summary) > 100 else summary
+            parts.append(f"      Summary: {summary_short}\n")
+        parts.append("\n")
+        self.formatted = "".join(parts)
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": self.timestamp,
+            "original_path": self.original_path,
+            "destination_path": self.destination_path,
+            "filename": self.filename,
+            "category": self.category,
+            "confidence": self.confidence,
+            "summary": self.summary,
+        }
+
 
 class MoveSession:
     """Track a batch of file movements"""
-    
+
     def __init__(self):
         self.session_start = datetime.now()
-        self.moves = []
-    
-    def add_move(self, original_path: str, destination_path: str, category: str, 
+        self.moves = []  # chronological order
+        # Bucketed at insert time so generate_report never has to rescan
+        # and group all moves; both structures hold the same records.
+        self.by_category = {}
+        # Machine-readable journal, appended one line per move as it
+        # happens so a crash mid-session loses nothing. Opened lazily so
+        # empty sessions leave no file behind.
+        self._jsonl = None
+
+    def add_move(self, original_path: str, destination_path: str, category: str,
                  confidence: float, summary: str = ""):
         """Record a file movement"""
-        self.moves.append({
-            "timestamp": datetime.now().isoformat(),
-            "original_path": original_path,
-            "destination_path": destination_path,
-            "filename": Path(original_path).name,
-            "category": category,
-            "confidence": confidence,
-            "summary": summary
-        })
-    
+        record = MoveRecord(original_path, destination_path, category,
+                            confidence, summary)
+        self.moves.append(record)
+        self.by_category.setdefault(category, []).append(record)
+        try:
+            if self._jsonl is None:
+                timestamp = self.session_start.strftime('%Y%m%d_%H%M%S')
+                self._jsonl = open(
+                    MOVE_LOGS_DIR / f"moves_{timestamp}.jsonl",
+                    'w', buffering=1 << 16, encoding='utf-8'
+                )
+            # No fsync per move: the 64 KB buffer batches the writes
+            self._jsonl.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not journal move: {e}")
+
     def generate_report(self) -> str:
         """Generate a text report of all moves in this session"""
         if not self.moves:
             return "No files moved in this session."
-        
+
         session_end = datetime.now()
         duration = (session_end - self.session_start).total_seconds()
-        
-        report = []
-        report.append("=" * 80)
-        report.append("LEOLOGIC FILE ORGANIZATION REPORT")
-        report.append("=" * 80)
-        report.append(f"Session Start: {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Session End:   {session_end.strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Duration:      {duration:.1f} seconds")
-        report.append(f"Files Moved:   {len(self.moves)}")
-        report.append("")
-        report.append("=" * 80)
-        report.append("FILE MOVEMENTS")
-        report.append("=" * 80)
-        report.append("")
-        
-        # Group by category
-        by_category = {}
-        for move in self.moves:
-            cat = move['category']
-            if cat not in by_category:
-                by_category[cat] = []
-            by_category[cat].append(move)
-        
-        for category, moves in sorted(by_category.items()):
-            report.append(f"📁 CATEGORY: {category}")
-            report.append(f"   Files: {len(moves)}")
-            report.append("")
-            
+
+        # Write into one growing buffer rather than a list of ~8 string
+        # fragments per move joined at the end.
+        out = io.StringIO()
+        write = out.write
+        write("=" * 80 + "\n")
+        write("LEOLOGIC FILE ORGANIZATION REPORT\n")
+        write("=" * 80 + "\n")
+        write(f"Session Start: {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write(f"Session End:   {session_end.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write(f"Duration:      {duration:.1f} seconds\n")
+        write(f"Files Moved:   {len(self.moves)}\n")
+        write("\n")
+        write("=" * 80 + "\n")
+        write("FILE MOVEMENTS\n")
+        write("=" * 80 + "\n")
+        write("\n")
+
+        for category, moves in sorted(self.by_category.items()):
+            write(f"📁 CATEGORY: {category}\n   Files: {len(moves)}\n\n")
+
             for i, move in enumerate(moves, 1):
-                report.append(f"   {i}. {move['filename']}")
-                report.append(f"      From: {move['original_path']}")
-                report.append(f"      To:   {move['destination_path']}")
-                report.append(f"      Confidence: {move['confidence']:.1%}")
-                if move['summary']:
-                    summary_short = move['summary'][:100] + "..." if len(move['summary']) > 100 else move['summary']
-                    report.append(f"      Summary: {summary_short}")
-                report.append("")
-        
-        report.append("=" * 80)
-        report.append("END OF REPORT")
-        report.append("=" * 80)
-        
-        return "\n".join(report)
-    
+                write(f"   {i}. {move.formatted}")
+
+        write("=" * 80 + "\n")
+        write("END OF REPORT\n")
+        write("=" * 80)
+
+        return out.getvalue()
+
     def save_report(self) -> str:
         """Save report to file and return path"""
         timestamp = self.session_start.strftime('%Y%m%d_%H%M%S')
         report_filename = f"move_report_{timestamp}.txt"
         report_path = MOVE_LOGS_DIR / report_filename
-        
+
         # Generate text report
         text_report = self.generate_report()
-        
+
         # Save text report
         with open(report_path, 'w', encoding='utf-8') as f:
             f.write(text_report)
-        
+
         # Also save JSON for machine parsing
         json_path = report_path.with_suffix('.json')
         json_data = {
             "session_start": self.session_start.isoformat(),
             "session_end": datetime.now().isoformat(),
             "total_files": len(self.moves),
-            "moves": self.moves
+            "moves": [move.to_dict() for move in self.moves]
         }
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
-        
+
+        # orjson's C pretty-printer is an order of magnitude faster than
+        # stdlib's for big sessions; the stdlib path streams straight to
+        # the file rather than building the whole string first.
+        if HAS_ORJSON:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(json_data, f, indent=2, ensure_ascii=False)
+
+        # Retire the journal: force it to disk, then drop it now that the
+        # full report supersedes it.
+        if self._jsonl is not None:
+            try:
+                journal_name = self._jsonl.name
+                self._jsonl.flush()
+                os.fsync(self._jsonl.fileno())
+                self._jsonl.close()
+                os.unlink(journal_name)
+            except OSError as e:
+                print(f"⚠️ Could not finalize move journal: {e}")
+            self._jsonl = None
+
         print(f"📊 Move report saved: {report_path}")
         return str(report_path)
 
@@ -119,7 +193,7 @@ def start_new_session():
     current_session = MoveSession()
 
 
-def add_move(original_path: str, destination_path: str, category: str, 
+def add_move(original_path: str, destination_path: str, category: str,
             confidence: float, summary: str = ""):
     """Add a move to current session"""
     current_session.add_move(original_path, destination_path, category, confidence, summary)